@@ -0,0 +1,11 @@
+file(REMOVE_RECURSE
+  "../bin/client"
+  "../bin/client.pdb"
+  "CMakeFiles/client.dir/client/main.c.o"
+  "CMakeFiles/client.dir/client/main.c.o.d"
+)
+
+# Per-language clean rules from dependency scanning.
+foreach(lang C)
+  include(CMakeFiles/client.dir/cmake_clean_${lang}.cmake OPTIONAL)
+endforeach()
@@ -0,0 +1,21 @@
+
+# Consider dependencies only in project.
+set(CMAKE_DEPENDS_IN_PROJECT_ONLY OFF)
+
+# The set of languages for which implicit dependencies are needed:
+set(CMAKE_DEPENDS_LANGUAGES
+  )
+
+# The set of dependency files which are needed:
+set(CMAKE_DEPENDS_DEPENDENCY_FILES
+  "/root/package/src/common/crc32.c" "src/CMakeFiles/ruft_common.dir/common/crc32.c.o" "gcc" "src/CMakeFiles/ruft_common.dir/common/crc32.c.o.d"
+  "/root/package/src/common/protocol.c" "src/CMakeFiles/ruft_common.dir/common/protocol.c.o" "gcc" "src/CMakeFiles/ruft_common.dir/common/protocol.c.o.d"
+  "/root/package/src/common/util.c" "src/CMakeFiles/ruft_common.dir/common/util.c.o" "gcc" "src/CMakeFiles/ruft_common.dir/common/util.c.o.d"
+  )
+
+# Targets to which this target links.
+set(CMAKE_TARGET_LINKED_INFO_FILES
+  )
+
+# Fortran module output directory.
+set(CMAKE_Fortran_TARGET_MODULE_DIR "")
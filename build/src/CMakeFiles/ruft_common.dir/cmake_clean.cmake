@@ -0,0 +1,15 @@
+file(REMOVE_RECURSE
+  "CMakeFiles/ruft_common.dir/common/crc32.c.o"
+  "CMakeFiles/ruft_common.dir/common/crc32.c.o.d"
+  "CMakeFiles/ruft_common.dir/common/protocol.c.o"
+  "CMakeFiles/ruft_common.dir/common/protocol.c.o.d"
+  "CMakeFiles/ruft_common.dir/common/util.c.o"
+  "CMakeFiles/ruft_common.dir/common/util.c.o.d"
+  "libruft_common.a"
+  "libruft_common.pdb"
+)
+
+# Per-language clean rules from dependency scanning.
+foreach(lang C)
+  include(CMakeFiles/ruft_common.dir/cmake_clean_${lang}.cmake OPTIONAL)
+endforeach()
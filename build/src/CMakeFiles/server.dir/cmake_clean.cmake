@@ -0,0 +1,11 @@
+file(REMOVE_RECURSE
+  "../bin/server"
+  "../bin/server.pdb"
+  "CMakeFiles/server.dir/server/main.c.o"
+  "CMakeFiles/server.dir/server/main.c.o.d"
+)
+
+# Per-language clean rules from dependency scanning.
+foreach(lang C)
+  include(CMakeFiles/server.dir/cmake_clean_${lang}.cmake OPTIONAL)
+endforeach()
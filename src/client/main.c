@@ -7,21 +7,29 @@
 #include "../common/util.h"
 #include "../common/crc32.h"
 
+#ifdef _WIN32
+#include <io.h>
+#include <fcntl.h>
+#endif
+
 
 
 typedef struct {
     char host[256];
     int port;
     char file[1024];
+    char name[256];
     size_t chunk;
     uint16_t window;
     int timeout_ms;
     int max_retries;
+    int sndbuf;
+    int daemon;
 } Args;
 
 static void usage(const char* prog) {
-    fprintf(stderr, "Usage: %s --host <host> --port <port> --file <path> "
-            "[--chunk 1024] [--window 8] [--timeout 300] [--max-retries 20]\n", prog);
+    fprintf(stderr, "Usage: %s --host <host> --port <port> --file <path|-> [--name <name>] "
+            "[--chunk 1024] [--window 8] [--timeout 300] [--max-retries 20] [--sndbuf 0] [--daemon]\n", prog);
 }
 
 static int parse_args(int argc, char** argv, Args* args) {
@@ -29,10 +37,13 @@ static int parse_args(int argc, char** argv, Args* args) {
     strcpy(args->host, "127.0.0.1");
     args->port = 9000;
     args->file[0] = '\0';
+    args->name[0] = '\0';
     args->chunk = 1024;
     args->window = 8;
     args->timeout_ms = 300;
     args->max_retries = 20;
+    args->sndbuf = 0;
+    args->daemon = 0;
     
     for (int i = 1; i < argc; i++) {
         char* a = argv[i];
@@ -45,6 +56,9 @@ static int parse_args(int argc, char** argv, Args* args) {
         } else if (strcmp(a, "--file") == 0 && i+1 < argc) {
             strncpy(args->file, argv[++i], sizeof(args->file) - 1);
             args->file[sizeof(args->file) - 1] = '\0';
+        } else if (strcmp(a, "--name") == 0 && i+1 < argc) {
+            strncpy(args->name, argv[++i], sizeof(args->name) - 1);
+            args->name[sizeof(args->name) - 1] = '\0';
         } else if (strcmp(a, "--chunk") == 0 && i+1 < argc) {
             args->chunk = (size_t)atol(argv[++i]);
         } else if (strcmp(a, "--window") == 0 && i+1 < argc) {
@@ -53,6 +67,10 @@ static int parse_args(int argc, char** argv, Args* args) {
             args->timeout_ms = atoi(argv[++i]);
         } else if (strcmp(a, "--max-retries") == 0 && i+1 < argc) {
             args->max_retries = atoi(argv[++i]);
+        } else if (strcmp(a, "--sndbuf") == 0 && i+1 < argc) {
+            args->sndbuf = atoi(argv[++i]);
+        } else if (strcmp(a, "--daemon") == 0) {
+            args->daemon = 1;
         } else if (strncmp(a, "--", 2) == 0) {
             fprintf(stderr, "Unknown flag: %s\n", a);
             usage(argv[0]);
@@ -64,7 +82,7 @@ static int parse_args(int argc, char** argv, Args* args) {
         }
     }
     
-    if (strlen(args->file) == 0) {
+    if (!args->daemon && strlen(args->file) == 0) {
         fprintf(stderr, "Missing required --file argument\n");
         usage(argv[0]);
         return 0;
@@ -87,36 +105,11 @@ static void cleanup_resources(uint8_t** chunks, size_t total, uint8_t* data,
     if (res) freeaddrinfo(res);
 }
 
-int main(int argc, char** argv) {
-#ifdef _WIN32
-    // Initialize Winsock
-    WSADATA wsaData;
-    int result = WSAStartup(MAKEWORD(2, 2), &wsaData);
-    if (result != 0) {
-        fprintf(stderr, "WSAStartup failed: %d\n", result);
-        return 1;
-    }
-#endif
-
-    Args args;
-    if (!parse_args(argc, argv, &args)) {
-#ifdef _WIN32
-
-
-
-        WSACleanup();
-#endif
-        return 1;
-    }
-
-    /* Read file */
-    FILE* fp = fopen(args.file, "rb");
+static uint8_t* read_file(const char* path, long* size_out) {
+    FILE* fp = fopen(path, "rb");
     if (!fp) {
-        fprintf(stderr, "Cannot open file: %s\n", args.file);
-#ifdef _WIN32
-        WSACleanup();
-#endif
-        return 1;
+        fprintf(stderr, "Cannot open file: %s\n", path);
+        return NULL;
     }
     
     /* Get file size */
@@ -127,36 +120,79 @@ int main(int argc, char** argv) {
     if (filesize < 0) {
         fprintf(stderr, "Error getting file size\n");
         fclose(fp);
-#ifdef _WIN32
-        WSACleanup();
-#endif
-        return 1;
+        return NULL;
     }
     
-    /* Calculate total packets */
-    size_t total = (filesize + args.chunk - 1) / args.chunk;
-    
     /* Read entire file */
     uint8_t* data = malloc(filesize);
     if (!data) {
         fprintf(stderr, "Memory allocation failed\n");
         fclose(fp);
-#ifdef _WIN32
-        WSACleanup();
-#endif
-        return 1;
+        return NULL;
     }
     
     if (fread(data, 1, filesize, fp) != (size_t)filesize) {
         fprintf(stderr, "Failed to read file\n");
         free(data);
         fclose(fp);
+        return NULL;
+    }
+    fclose(fp);
+    
+    *size_out = filesize;
+    return data;
+}
+
+/* Read a stream of unknown length (e.g. stdin) until EOF */
+static uint8_t* read_stream(FILE* fp, long* size_out) {
 #ifdef _WIN32
-        WSACleanup();
+    _setmode(_fileno(fp), _O_BINARY);
 #endif
+    size_t cap = 1 << 20;
+    size_t len = 0;
+    uint8_t* data = malloc(cap);
+    if (!data) {
+        fprintf(stderr, "Memory allocation failed\n");
+        return NULL;
+    }
+    
+    size_t n;
+    while ((n = fread(data + len, 1, cap - len, fp)) > 0) {
+        len += n;
+        if (len == cap) {
+            uint8_t* grown = realloc(data, cap * 2);
+            if (!grown) {
+                fprintf(stderr, "Memory allocation failed\n");
+                free(data);
+                return NULL;
+            }
+            data = grown;
+            cap *= 2;
+        }
+    }
+    
+    if (ferror(fp)) {
+        fprintf(stderr, "Failed to read stdin\n");
+        free(data);
+        return NULL;
+    }
+    
+    *size_out = (long)len;
+    return data;
+}
+
+static int transfer_file(const Args* args) {
+    /* Read the whole input into memory; "-" means stdin */
+    long filesize = 0;
+    uint8_t* data = strcmp(args->file, "-") == 0
+        ? read_stream(stdin, &filesize)
+        : read_file(args->file, &filesize);
+    if (!data) {
         return 1;
     }
-    fclose(fp);
+    
+    /* Calculate total packets */
+    size_t total = (filesize + args->chunk - 1) / args->chunk;
     
     /* Resolve host */
     struct addrinfo hints, *res = NULL;
@@ -165,14 +201,11 @@ int main(int argc, char** argv) {
     hints.ai_socktype = SOCK_DGRAM;
     
     char port_str[16];
-    snprintf(port_str, sizeof(port_str), "%d", args.port);
+    snprintf(port_str, sizeof(port_str), "%d", args->port);
     
-    if (getaddrinfo(args.host, port_str, &hints, &res) != 0) {
+    if (getaddrinfo(args->host, port_str, &hints, &res) != 0) {
         fprintf(stderr, "Failed to resolve host\n");
         free(data);
-#ifdef _WIN32
-        WSACleanup();
-#endif
         return 1;
     }
     
@@ -182,7 +215,6 @@ int main(int argc, char** argv) {
         fprintf(stderr, "socket failed: %d\n", WSAGetLastError());
         freeaddrinfo(res);
         free(data);
-        WSACleanup();
 #else
         fprintf(stderr, "socket failed: %s\n", strerror(errno));
         freeaddrinfo(res);
@@ -191,6 +223,11 @@ int main(int argc, char** argv) {
         return 1;
     }
 
+    /* A larger send buffer lets a full window go out without blocking */
+    if (args->sndbuf > 0 && set_socket_buffer(sock, 0, args->sndbuf) != 0) {
+        fprintf(stderr, "Warning: could not set send buffer to %d bytes\n", args->sndbuf);
+    }
+
     /* Non-blocking receive */
 #ifdef _WIN32
     u_long mode = 1;
@@ -199,7 +236,6 @@ int main(int argc, char** argv) {
         closesocket(sock);
         freeaddrinfo(res);
         free(data);
-        WSACleanup();
         return 1;
     }
 #else
@@ -222,7 +258,7 @@ int main(int argc, char** argv) {
 
     char* time_str = now_time();
     printf("[%s] Client connecting to %s:%d sending %s (%ld bytes, %zu packets)\n",
-           time_str, args.host, args.port, args.file, filesize, total);
+           time_str, args->host, args->port, args->file, filesize, total);
     free(time_str);
 
     /* HANDSHAKE */
@@ -233,16 +269,19 @@ int main(int argc, char** argv) {
     hs.version = VERSION;
     hs.ptype = PT_HANDSHAKE;
     
-    /* Extract filename */
-    char* fname = strrchr(args.file, '/');
-    if (!fname) fname = strrchr(args.file, '\\');
-    if (!fname) fname = args.file;
+    /* Extract filename; --name overrides the path, and stdin has no other name */
+    const char* source = args->name[0] ? args->name
+                       : strcmp(args->file, "-") == 0 ? "stdin"
+                       : args->file;
+    const char* fname = strrchr(source, '/');
+    if (!fname) fname = strrchr(source, '\\');
+    if (!fname) fname = source;
     else fname++; /* Skip the separator */
     
     /* Create metadata string */
     char meta[1024];
     snprintf(meta, sizeof(meta), "%s|%ld|%zu|%zu|%d",
-             fname, filesize, total, args.chunk, args.window);
+             fname, filesize, total, args->chunk, args->window);
     
     hs.payload_size = strlen(meta);
     hs.payload = (uint8_t*)meta;
@@ -254,9 +293,6 @@ int main(int argc, char** argv) {
     if (!buf) {
         fprintf(stderr, "Failed to pack handshake\n");
         cleanup_resources(NULL, 0, data, sock, res);
-#ifdef _WIN32
-        WSACleanup();
-#endif
         return 1;
     }
 
@@ -266,11 +302,11 @@ int main(int argc, char** argv) {
 
     int tries = 0;
     int hs_ackd = 0;
-    while (tries < args.max_retries && !hs_ackd) {
+    while (tries < args->max_retries && !hs_ackd) {
         sendto(sock, (char*)buf, (int)packed_size, 0, (struct sockaddr*)&peer, peerlen);
         
         uint64_t t0 = ms_since(0);
-        while (ms_since(t0) < (uint64_t)args.timeout_ms) {
+        while (ms_since(t0) < (uint64_t)args->timeout_ms) {
             uint8_t rbuf[2048];
             struct sockaddr_storage from;
             int fromlen = sizeof(from);
@@ -309,9 +345,6 @@ int main(int argc, char** argv) {
     if (!hs_ackd) {
         fprintf(stderr, "Handshake failed\n");
         cleanup_resources(NULL, 0, data, sock, res);
-#ifdef _WIN32
-        WSACleanup();
-#endif
         return 2;
     }
     
@@ -325,15 +358,12 @@ int main(int argc, char** argv) {
     if (!chunks || !chunk_sizes) {
         fprintf(stderr, "Memory allocation failed\n");
         cleanup_resources(NULL, 0, data, sock, res);
-#ifdef _WIN32
-        WSACleanup();
-#endif
         return 1;
     }
     
     for (size_t i = 0; i < total; i++) {
-        size_t off = i * args.chunk;
-        size_t len = (off + args.chunk > (size_t)filesize) ? (size_t)filesize - off : args.chunk;
+        size_t off = i * args->chunk;
+        size_t len = (off + args->chunk > (size_t)filesize) ? (size_t)filesize - off : args->chunk;
         chunks[i] = malloc(len);
         if (!chunks[i]) {
             fprintf(stderr, "Memory allocation failed\n");
@@ -346,9 +376,6 @@ int main(int argc, char** argv) {
             free(chunks);
             free(chunk_sizes);
             cleanup_resources(NULL, 0, data, sock, res);
-#ifdef _WIN32
-            WSACleanup();
-#endif
             return 1;
         }
         memcpy(chunks[i], data + off, len);
@@ -363,7 +390,7 @@ int main(int argc, char** argv) {
 
     /* Main GBN send loop */
     while (base < total) {
-        while (nextseq < total && nextseq < base + args.window) {
+        while (nextseq < total && nextseq < base + args->window) {
             /* Send data packet */
             Packet d;
             memset(&d, 0, sizeof(d));
@@ -373,7 +400,7 @@ int main(int argc, char** argv) {
             d.ptype = PT_DATA;
             d.seq = nextseq;
             d.total = total;
-            d.window = args.window;
+            d.window = args->window;
             d.payload = chunks[nextseq];
             d.payload_size = chunk_sizes[nextseq];
             
@@ -424,12 +451,12 @@ int main(int argc, char** argv) {
         }
         
         /* Check timeout */
-        if (timer_running && ms_since(timer_t0) > (uint64_t)args.timeout_ms) {
+        if (timer_running && ms_since(timer_t0) > (uint64_t)args->timeout_ms) {
             /* Timeout - retransmit from base */
             timer_running = 0;
             retries++;
             
-            if (retries > args.max_retries) {
+            if (retries > args->max_retries) {
                 fprintf(stderr, "Max retries exceeded\n");
                 /* Cleanup */
                 for (size_t i = 0; i < total; i++) {
@@ -440,9 +467,6 @@ int main(int argc, char** argv) {
                 free(chunks);
                 free(chunk_sizes);
                 cleanup_resources(NULL, 0, data, sock, res);
-#ifdef _WIN32
-                WSACleanup();
-#endif
                 return 3;
             }
             
@@ -457,7 +481,7 @@ int main(int argc, char** argv) {
                     d.ptype = PT_DATA;
                     d.seq = s;
                     d.total = total;
-                    d.window = args.window;
+                    d.window = args->window;
                     d.payload = chunks[s];
                     d.payload_size = chunk_sizes[s];
                     
@@ -495,19 +519,16 @@ int main(int argc, char** argv) {
         free(chunks);
         free(chunk_sizes);
         cleanup_resources(NULL, 0, data, sock, res);
-#ifdef _WIN32
-        WSACleanup();
-#endif
         return 1;
     }
     
     int fin_ok = 0;
     tries = 0;
-    while (tries < args.max_retries && !fin_ok) {
+    while (tries < args->max_retries && !fin_ok) {
         sendto(sock, (char*)bfin, (int)fin_packed_size, 0, (struct sockaddr*)&peer, peerlen);
         
         uint64_t t0 = ms_since(0);
-        while (ms_since(t0) < (uint64_t)args.timeout_ms) {
+        while (ms_since(t0) < (uint64_t)args->timeout_ms) {
             uint8_t rbuf2[2048];
             struct sockaddr_storage from2;
             int fromlen2 = sizeof(from2);
@@ -554,9 +575,6 @@ int main(int argc, char** argv) {
         free(chunks);
         free(chunk_sizes);
         cleanup_resources(NULL, 0, data, sock, res);
-#ifdef _WIN32
-        WSACleanup();
-#endif
         return 4;
     }
 
@@ -573,8 +591,55 @@ int main(int argc, char** argv) {
     free(chunks);
     free(chunk_sizes);
     cleanup_resources(NULL, 0, data, sock, res);
+    return 0;
+}
+
+/* Daemon mode: read "<host> <port> <path>" jobs from stdin, one per line,
+ * and report each result on stdout as "EXIT <code>". Chunk, window, timeout
+ * and retry settings come from the daemon's own command line. */
+static int run_daemon(const Args* defaults) {
+    char line[1400];
+    while (fgets(line, sizeof(line), stdin)) {
+        Args job = *defaults;
+        int rc;
+        if (sscanf(line, "%255s %d %1023[^\r\n]", job.host, &job.port, job.file) != 3) {
+            fprintf(stderr, "Malformed job: %s", line);
+            rc = 1;
+        } else if (strcmp(job.file, "-") == 0) {
+            /* stdin carries the job stream itself */
+            fprintf(stderr, "Cannot send stdin in daemon mode\n");
+            rc = 1;
+        } else {
+            rc = transfer_file(&job);
+        }
+        printf("EXIT %d\n", rc);
+        fflush(stdout);
+    }
+    return 0;
+}
+
+int main(int argc, char** argv) {
+#ifdef _WIN32
+    // Initialize Winsock
+    WSADATA wsaData;
+    int result = WSAStartup(MAKEWORD(2, 2), &wsaData);
+    if (result != 0) {
+        fprintf(stderr, "WSAStartup failed: %d\n", result);
+        return 1;
+    }
+#endif
+
+    Args args;
+    if (!parse_args(argc, argv, &args)) {
+#ifdef _WIN32
+        WSACleanup();
+#endif
+        return 1;
+    }
+
+    int rc = args.daemon ? run_daemon(&args) : transfer_file(&args);
 #ifdef _WIN32
     WSACleanup();
 #endif
-    return 0;
+    return rc;
 }
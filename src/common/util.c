@@ -90,3 +90,20 @@ uint64_t ms_since(uint64_t t0) {
     return now - t0;
 #endif
 }
+
+/* Request a socket buffer of `bytes` (SO_RCVBUF if `receive`, else SO_SNDBUF).
+ * Where available the privileged *BUFFORCE option is tried first so the size
+ * is not capped by net.core.rmem_max / net.core.wmem_max. Returns 0 on success. */
+int set_socket_buffer(SOCKET_TYPE sock, int receive, int bytes) {
+#ifdef SO_RCVBUFFORCE
+    int forced = receive ? SO_RCVBUFFORCE : SO_SNDBUFFORCE;
+    if (setsockopt(sock, SOL_SOCKET, forced, (const char*)&bytes, sizeof(bytes)) == 0) {
+        return 0;
+    }
+#endif
+    int opt = receive ? SO_RCVBUF : SO_SNDBUF;
+    if (setsockopt(sock, SOL_SOCKET, opt, (const char*)&bytes, sizeof(bytes)) != 0) {
+        return -1;
+    }
+    return 0;
+}
@@ -4,10 +4,13 @@
 #include <stdint.h>
 #include <stddef.h>
 
+#include "platform.h"
+
 /* Function declarations */
 char** split(const char* s, char delim, int* count);
 void free_split_result(char** result, int count);
 char* now_time(void);
 uint64_t ms_since(uint64_t t0);
+int set_socket_buffer(SOCKET_TYPE sock, int receive, int bytes);
 
 #endif /* UTIL_H */
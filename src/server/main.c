@@ -14,6 +14,7 @@ typedef struct {
     int port;
     char outdir[1024];
     uint16_t window;
+    int rcvbuf;
 } Args;
 
 typedef struct {
@@ -30,7 +31,7 @@ typedef struct {
 } Session;
 
 static void usage(const char* prog) {
-    fprintf(stderr, "Usage: %s [--port 9000] [--out ./server_data] [--window 8]\n", prog);
+    fprintf(stderr, "Usage: %s [--port 9000] [--out ./server_data] [--window 8] [--rcvbuf 0]\n", prog);
 }
 
 static int parse_args(int argc, char** argv, Args* a) {
@@ -38,6 +39,7 @@ static int parse_args(int argc, char** argv, Args* a) {
     a->port = 9000;
     strcpy(a->outdir, "./server_data");
     a->window = 8;
+    a->rcvbuf = 0;
     
     for (int i = 1; i < argc; i++) {
         char* s = argv[i];
@@ -48,6 +50,8 @@ static int parse_args(int argc, char** argv, Args* a) {
             a->outdir[sizeof(a->outdir) - 1] = '\0';
         } else if (strcmp(s, "--window") == 0 && i+1 < argc) {
             a->window = (uint16_t)atoi(argv[++i]);
+        } else if (strcmp(s, "--rcvbuf") == 0 && i+1 < argc) {
+            a->rcvbuf = atoi(argv[++i]);
         } else {
             usage(argv[0]);
             return 0;
@@ -142,6 +146,11 @@ int main(int argc, char** argv) {
         return 1;
     }
 
+    /* A larger receive buffer absorbs bursts instead of dropping them */
+    if (args.rcvbuf > 0 && set_socket_buffer(sock, 1, args.rcvbuf) != 0) {
+        fprintf(stderr, "Warning: could not set receive buffer to %d bytes\n", args.rcvbuf);
+    }
+
     struct sockaddr_in addr;
     memset(&addr, 0, sizeof(addr));
     addr.sin_family = AF_INET;
@@ -227,6 +236,10 @@ int main(int argc, char** argv) {
             continue;
         }
 
+        /* Datagrams shorter than a header (e.g. readiness probes) can never
+           unpack; drop them without reporting an error */
+        if (n < HEADER_SIZE) continue;
+
         char* key = addr_key(&from);
         Packet p;
         if (unpack(buf, n, &p) == 0) {
@@ -1,29 +1,135 @@
+import asyncio
+import io
 import os
+import socket
 import subprocess
+import tempfile
 import time
 import signal
 import shutil
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+
+
+# Project layout, resolved once at import (this file lives 2 levels below the root)
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+_BUILD_DIR = str(_PROJECT_ROOT / "build" / "bin")
+_SERVER_DATA_DIR = str(_PROJECT_ROOT / "server_data")
+_SAMPLE_DATA_DIR = str(_PROJECT_ROOT / "sample_data")
+_SERVER_EXE = f"{_BUILD_DIR}/server.exe"
+_CLIENT_EXE = f"{_BUILD_DIR}/client.exe"
+
+# Default socket buffer size requested from the client and server binaries
+_SOCKET_BUFFER_SIZE = 4 << 20
+
+# Number of leading bytes checked before a full comparison
+_PREFIX_SIZE = 8192
+
+# Block size for the full comparison
+_BLOCK_SIZE = 1 << 20
+
+
+def _udp_port_bound(port: int, timeout: float = 0.05) -> bool:
+    """Check whether something is bound to a local UDP port.
+    
+    A datagram sent to an unbound port triggers an ICMP port-unreachable,
+    which surfaces as a refused/reset error on the next receive. Silence
+    within the timeout means the datagram was accepted.
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+        s.settimeout(timeout)
+        try:
+            s.connect(("127.0.0.1", port))
+            s.send(b"\x00")
+            s.recv(1)
+        except socket.timeout:
+            return True
+        except OSError:
+            return False
+        return True
+
+
+def _stop_client_daemon(process: subprocess.Popen) -> None:
+    """Close a client daemon's job stream and wait for it to exit."""
+    if process.poll() is None:
+        # EOF on stdin ends the daemon's job loop
+        process.stdin.close()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def _streams_equal(f1, f2) -> bool:
+    """Compare two binary streams block by block.
+    
+    Each stream is read on its own worker thread into one of two reusable
+    buffers, so the next pair of blocks is being read while the current
+    pair is compared.
+    """
+    buffers1 = (bytearray(_BLOCK_SIZE), bytearray(_BLOCK_SIZE))
+    buffers2 = (bytearray(_BLOCK_SIZE), bytearray(_BLOCK_SIZE))
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        current = 0
+        pending = (pool.submit(f1.readinto, buffers1[0]), pool.submit(f2.readinto, buffers2[0]))
+        while True:
+            n1, n2 = pending[0].result(), pending[1].result()
+            if n1 != n2:
+                return False
+            if n1 == 0:
+                return True
+            
+            buf1, buf2 = buffers1[current], buffers2[current]
+            current ^= 1
+            pending = (pool.submit(f1.readinto, buffers1[current]), pool.submit(f2.readinto, buffers2[current]))
+            
+            # bytearray equality is a single memcmp; only a short final block needs slicing
+            if n1 == _BLOCK_SIZE:
+                same = buf1 == buf2
+            else:
+                same = buf1[:n1] == buf2[:n1]
+            if not same:
+                return False
+
+
+def _drain(stream, buffer: io.StringIO) -> None:
+    """Copy a pipe into a buffer until EOF so the writer never blocks on it."""
+    for line in stream:
+        buffer.write(line)
+    stream.close()
 
 
 class UdpTransferLibrary:
     """Robot Framework library for testing UDP reliable transfer protocol."""
-    
+
+    # One instance per suite, so the persistent client outlives each test case
+    ROBOT_LIBRARY_SCOPE = 'SUITE'
+
     def __init__(self):
         self.server_process = None
-        # Get the project root directory (2 levels up from this file)
-        project_root = Path(__file__).parent.parent.parent
-        self.build_dir = str(project_root / "build" / "bin")
-        self.server_data_dir = str(project_root / "server_data")
-        self.sample_data_dir = str(project_root / "sample_data")
+        self.server_port = None
+        self.client_process = None
+        self.client_output = ""
+        self._stdout_buf = io.StringIO()
+        self._stderr_buf = io.StringIO()
+        self._drain_threads = []
+        self.build_dir = _BUILD_DIR
+        self.server_data_dir = _SERVER_DATA_DIR
+        self.sample_data_dir = _SAMPLE_DATA_DIR
+        self.server_exe = _SERVER_EXE
+        self.client_exe = _CLIENT_EXE
     
-    def start_server(self, port: int = 9000, output_dir: str = None) -> None:
+    def start_server(self, port: int = 9000, output_dir: str = None, rcvbuf: int = _SOCKET_BUFFER_SIZE) -> None:
         """Start the UDP server.
         
         Args:
             port: Server port number
             output_dir: Directory where received files will be saved
+            rcvbuf: Socket receive buffer size in bytes
         """
         if self.server_process:
             self.stop_server()
@@ -36,19 +142,37 @@ class UdpTransferLibrary:
         os.makedirs(output_dir, exist_ok=True)
         
         # Start server process
-        server_cmd = [f"{self.build_dir}/server.exe", "--port", str(port), "--out", output_dir]
+        server_cmd = [self.server_exe, "--port", str(port), "--out", output_dir, "--rcvbuf", str(rcvbuf)]
         self.server_process = subprocess.Popen(
             server_cmd,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             text=True
         )
+        self.server_port = port
+        
+        # Drain both pipes continuously so a full pipe never stalls the server
+        self._stdout_buf = io.StringIO()
+        self._stderr_buf = io.StringIO()
+        self._drain_threads = [
+            threading.Thread(target=_drain, args=(self.server_process.stdout, self._stdout_buf), daemon=True),
+            threading.Thread(target=_drain, args=(self.server_process.stderr, self._stderr_buf), daemon=True),
+        ]
+        for thread in self._drain_threads:
+            thread.start()
         
-        # Wait a bit for server to start
-        time.sleep(0.5)
+        # Wait until the server has bound its socket
+        ready = self.wait_for_server_ready()
         
         if self.server_process.poll() is not None:
-            raise RuntimeError(f"Server failed to start: {self.server_process.stderr.read()}")
+            # Bounded wait for the drains: on Windows an exited child can
+            # leave a pipe half-open, and an unbounded join would hang
+            deadline = time.monotonic() + 2
+            for thread in self._drain_threads:
+                thread.join(timeout=max(0.0, deadline - time.monotonic()))
+            raise RuntimeError(f"Server failed to start: {self._stderr_buf.getvalue()}")
+        if not ready:
+            raise RuntimeError(f"Server did not become ready on port {port}")
     
     def stop_server(self) -> None:
         """Stop the UDP server."""
@@ -60,39 +184,111 @@ class UdpTransferLibrary:
                 self.server_process.kill()
                 self.server_process.wait()
             self.server_process = None
+            self.server_port = None
     
     def send_file(self, host: str, port: int, file_path: str) -> int:
         """Send a file using the UDP client.
         
+        Transfers go through a persistent client started in ``--daemon``
+        mode, so the client is launched once rather than once per file.
+        
         Args:
             host: Server hostname/IP
             port: Server port
             file_path: Path to file to send
             
         Returns:
-            Exit code of the client process
+            Exit code of the client transfer
         """
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
         
-        client_cmd = [
-            f"{self.build_dir}/client.exe",
-            "--host", host,
-            "--port", str(port),
-            "--file", file_path
-        ]
+        client = self._get_client_daemon()
+        client.stdin.write(f"{host} {port} {os.path.abspath(file_path)}\n")
+        client.stdin.flush()
         
-        result = subprocess.run(client_cmd, capture_output=True, text=True)
-        return result.returncode
+        # Skip the transfer's progress output up to its result line
+        for line in client.stdout:
+            if line.startswith("EXIT "):
+                return int(line[len("EXIT "):])
+        raise RuntimeError("Client daemon exited unexpectedly")
+    
+    def send_files(self, host: str, port: int, file_paths: List[str], concurrency: Optional[int] = None) -> List[int]:
+        """Send several files concurrently, one client process per file.
+        
+        Args:
+            host: Server hostname/IP
+            port: Server port
+            file_paths: Paths of the files to send
+            concurrency: Maximum number of clients running at once
+                (defaults to four per CPU, capped at the number of files)
+            
+        Returns:
+            Exit code of each client process, in the order of file_paths
+        """
+        # A zero-sized semaphore would block every send forever
+        if concurrency is not None and concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+        
+        for file_path in file_paths:
+            if not os.path.exists(file_path):
+                raise FileNotFoundError(f"File not found: {file_path}")
+        
+        if not file_paths:
+            return []
+        if concurrency is None:
+            concurrency = min(len(file_paths), (os.cpu_count() or 1) * 4)
+        
+        return asyncio.run(self._send_files_async(host, port, file_paths, concurrency))
+    
+    async def _send_files_async(self, host: str, port: int, file_paths: List[str], concurrency: int) -> List[int]:
+        """Run one client per file, at most `concurrency` at a time."""
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def send(file_path: str) -> int:
+            async with semaphore:
+                process = await asyncio.create_subprocess_exec(
+                    self.client_exe,
+                    "--host", host,
+                    "--port", str(port),
+                    "--file", file_path,
+                    "--sndbuf", str(_SOCKET_BUFFER_SIZE),
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL
+                )
+                return await process.wait()
+        
+        return list(await asyncio.gather(*(send(file_path) for file_path in file_paths)))
+    
+    def stop_client(self) -> None:
+        """Stop the persistent client process, if one is running."""
+        if self.client_process:
+            _stop_client_daemon(self.client_process)
+            self.client_process = None
     
-    def send_file_with_options(self, host: str, port: int, file_path: str, **options) -> int:
+    def _get_client_daemon(self) -> subprocess.Popen:
+        """Return the persistent client process, starting it if needed."""
+        if self.client_process is None or self.client_process.poll() is not None:
+            self.client_process = subprocess.Popen(
+                [self.client_exe, "--daemon", "--sndbuf", str(_SOCKET_BUFFER_SIZE)],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True
+            )
+            weakref.finalize(self, _stop_client_daemon, self.client_process)
+        return self.client_process
+    
+    def send_file_with_options(self, host: str, port: int, file_path: str, quiet: bool = True, **options) -> int:
         """Send a file using the UDP client with custom options.
         
         Args:
             host: Server hostname/IP
             port: Server port
             file_path: Path to file to send
-            **options: Additional options (chunk, window, timeout, max_retries)
+            quiet: If True, discard the client's output instead of keeping it
+                for `Get Client Output`
+            **options: Additional options (chunk, window, timeout, max_retries, sndbuf)
             
         Returns:
             Exit code of the client process
@@ -101,7 +297,7 @@ class UdpTransferLibrary:
             raise FileNotFoundError(f"File not found: {file_path}")
         
         client_cmd = [
-            f"{self.build_dir}/client.exe",
+            self.client_exe,
             "--host", host,
             "--port", str(port),
             "--file", file_path
@@ -116,10 +312,27 @@ class UdpTransferLibrary:
             client_cmd.extend(["--timeout", str(options['timeout'])])
         if 'max_retries' in options:
             client_cmd.extend(["--max-retries", str(options['max_retries'])])
+        client_cmd.extend(["--sndbuf", str(options.get('sndbuf', _SOCKET_BUFFER_SIZE))])
+        
+        if quiet:
+            result = subprocess.run(client_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            return result.returncode
         
-        result = subprocess.run(client_cmd, capture_output=True, text=True)
+        # Spool output to disk rather than holding it in a pipe buffer
+        with tempfile.TemporaryFile(mode='w+') as output:
+            result = subprocess.run(client_cmd, stdout=output, stderr=subprocess.STDOUT)
+            output.seek(0)
+            self.client_output = output.read()
         return result.returncode
     
+    def get_client_output(self) -> str:
+        """Get the output of the last non-quiet `Send File With Options` call.
+        
+        Returns:
+            Client's combined stdout and stderr output as string
+        """
+        return self.client_output
+    
     def get_file_size(self, file_path: str) -> int:
         """Get the size of a file in bytes.
         
@@ -129,9 +342,10 @@ class UdpTransferLibrary:
         Returns:
             File size in bytes
         """
-        if not os.path.exists(file_path):
+        try:
+            return os.stat(file_path).st_size
+        except OSError:
             return 0
-        return os.path.getsize(file_path)
     
     def compare_files(self, file1: str, file2: str) -> bool:
         """Compare two files for equality.
@@ -143,25 +357,42 @@ class UdpTransferLibrary:
         Returns:
             True if files are identical, False otherwise
         """
-        if not os.path.exists(file1) or not os.path.exists(file2):
+        # One stat per file covers both the existence and the size check
+        try:
+            stat1 = os.stat(file1)
+            stat2 = os.stat(file2)
+        except OSError:
             return False
         
         # Compare file sizes first
-        if os.path.getsize(file1) != os.path.getsize(file2):
+        if stat1.st_size != stat2.st_size:
             return False
         
-        # Compare file contents
+        # Cheap prefix check so early mismatches return without a full read
+        with open(file1, 'rb') as f1, open(file2, 'rb') as f2:
+            if f1.read(_PREFIX_SIZE) != f2.read(_PREFIX_SIZE):
+                return False
+        
+        # The prefix check already covered small files in full
+        if stat1.st_size <= _PREFIX_SIZE:
+            return True
+        
         with open(file1, 'rb') as f1, open(file2, 'rb') as f2:
-            return f1.read() == f2.read()
+            return _streams_equal(f1, f2)
     
     def copy_file(self, src: str, dst: str) -> None:
         """Copy a file from source to destination.
         
+        Only the contents are copied, not timestamps or permissions, which
+        lets the copy use the platform's in-kernel fast path.
+        
         Args:
             src: Source file path
-            dst: Destination file path
+            dst: Destination file or directory path
         """
-        shutil.copy2(src, dst)
+        if os.path.isdir(dst):
+            dst = os.path.join(dst, os.path.basename(src))
+        shutil.copyfile(src, dst)
     
     def remove_file(self, file_path: str, missing_ok: bool = False) -> None:
         """Remove a file.
@@ -222,34 +453,35 @@ class UdpTransferLibrary:
         """Get the server's stdout output.
         
         Returns:
-            Server's stdout output as string
+            Server's stdout output captured so far, as string
         """
-        if self.server_process:
-            return self.server_process.stdout.read() if self.server_process.stdout else ""
-        return ""
+        return self._stdout_buf.getvalue()
     
     def get_server_error(self) -> str:
         """Get the server's stderr output.
         
         Returns:
-            Server's stderr output as string
+            Server's stderr output captured so far, as string
         """
-        if self.server_process:
-            return self.server_process.stderr.read() if self.server_process.stderr else ""
-        return ""
+        return self._stderr_buf.getvalue()
     
     def wait_for_server_ready(self, timeout: int = 10) -> bool:
         """Wait for server to be ready.
         
+        The server counts as ready once its UDP port is bound, which is
+        probed directly rather than waiting a fixed amount of time.
+        
         Args:
             timeout: Timeout in seconds
             
         Returns:
-            True if server is ready, False if timeout
+            True if server is ready, False if timeout or the server exited
         """
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            if self.server_process and self.server_process.poll() is None:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if not self.server_process or self.server_process.poll() is not None:
+                return False
+            if _udp_port_bound(self.server_port):
                 return True
-            time.sleep(0.1)
+            time.sleep(0.01)
         return False
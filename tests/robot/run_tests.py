@@ -5,20 +5,33 @@ Robot Framework test runner for UDP reliable transfer protocol.
 
 import os
 import sys
+import hashlib
+import tempfile
 import subprocess
 import argparse
 from pathlib import Path
 
 
 def install_requirements():
-    """Install Robot Framework requirements."""
+    """Install Robot Framework requirements.
+    
+    Skips pip when these exact requirements were already installed for the
+    current interpreter, tracked by a marker file named after their digest.
+    """
     requirements_file = Path(__file__).parent / "requirements.txt"
     if requirements_file.exists():
+        digest = hashlib.sha256(requirements_file.read_bytes() + sys.executable.encode()).hexdigest()
+        marker = Path(tempfile.gettempdir()) / f"udp_req_{digest}.ok"
+        if marker.exists():
+            print("Robot Framework requirements already installed")
+            return
+        
         print("Installing Robot Framework requirements...")
         subprocess.run([sys.executable, "-m", "pip", "install", "-r", str(requirements_file)], check=True)
+        marker.touch()
 
 
-def run_tests(test_file=None, output_dir=None, tags=None, exclude_tags=None):
+def run_tests(test_file=None, output_dir=None, tags=None, exclude_tags=None, parallel=False, processes=None):
     """Run Robot Framework tests.
     
     Args:
@@ -26,13 +39,18 @@ def run_tests(test_file=None, output_dir=None, tags=None, exclude_tags=None):
         output_dir: Output directory for test results
         tags: Tags to include
         exclude_tags: Tags to exclude
+        parallel: Run suites concurrently with pabot
+        processes: Number of pabot worker processes (defaults to CPU count)
     """
-    # Change to the robot test directory
+    # Tests run from the robot test directory; pass it as the child's cwd
+    # rather than changing this process's working directory
     robot_dir = Path(__file__).parent
-    os.chdir(robot_dir)
     
-    # Build the robot command
-    cmd = ["robot"]
+    # Build the robot command; pabot runs each suite in its own worker
+    if parallel:
+        cmd = ["pabot", "--processes", str(processes or os.cpu_count() or 1)]
+    else:
+        cmd = ["robot"]
     
     if output_dir:
         cmd.extend(["--outputdir", output_dir])
@@ -52,7 +70,7 @@ def run_tests(test_file=None, output_dir=None, tags=None, exclude_tags=None):
     print(f"Running Robot Framework tests with command: {' '.join(cmd)}")
     
     # Run the tests
-    result = subprocess.run(cmd)
+    result = subprocess.run(cmd, cwd=str(robot_dir))
     return result.returncode
 
 
@@ -63,6 +81,8 @@ def main():
     parser.add_argument("--tags", help="Tags to include")
     parser.add_argument("--exclude-tags", help="Tags to exclude")
     parser.add_argument("--install-requirements", action="store_true", help="Install requirements before running tests")
+    parser.add_argument("--parallel", action="store_true", help="Run test suites in parallel using pabot")
+    parser.add_argument("--processes", type=int, help="Number of parallel worker processes (default: CPU count)")
     
     args = parser.parse_args()
     
@@ -73,7 +93,9 @@ def main():
         test_file=args.test_file,
         output_dir=args.output_dir,
         tags=args.tags,
-        exclude_tags=args.exclude_tags
+        exclude_tags=args.exclude_tags,
+        parallel=args.parallel,
+        processes=args.processes
     )
 
 
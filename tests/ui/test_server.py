@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Tests for the Flask backend of the UDP Transfer UI.
+
+Run from the repository root with: python -m unittest discover tests/ui
+"""
+
+import io
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "ui"))
+
+import server  # noqa: E402
+
+
+class DebugUploadTest(unittest.TestCase):
+    """Tests for /api/debug/upload-test."""
+
+    def setUp(self):
+        self.client = server.app.test_client()
+
+    def test_accepts_a_file(self):
+        response = self.client.post(
+            "/api/debug/upload-test",
+            data={"file": (io.BytesIO(b"payload"), "sample.bin")},
+            content_type="multipart/form-data",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["filename"], "sample.bin")
+
+    def test_rejects_too_many_parts(self):
+        data = {f"field{i}": "x" for i in range(3000)}
+        data["file"] = (io.BytesIO(b"payload"), "sample.bin")
+        response = self.client.post(
+            "/api/debug/upload-test",
+            data=data,
+            content_type="multipart/form-data",
+        )
+        self.assertEqual(response.status_code, 413)
+        self.assertFalse(response.get_json()["success"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,21 +5,50 @@ Handles communication between the web UI and the UDP transfer executables
 """
 
 import os
+import re
 import sys
+import atexit
 import json
 import subprocess
 import threading
+import shutil
 import time
 import signal
 import socket
+import tempfile
+import io
+import unicodedata
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
-from flask import Flask, request, jsonify, send_file
+from urllib.parse import quote
+from flask import Flask, Request, Response, request, jsonify
+from flask import send_file as flask_send_file  # the /api/send view below is named send_file
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.wsgi import FileWrapper
 import psutil
+import orjson
+
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider that encodes with orjson, so every jsonify() uses it"""
+    sort_keys = False  # Key order doesn't matter to the UI; skip the sort
+    
+    def dumps(self, obj, **kwargs):
+        try:
+            return orjson.dumps(obj).decode()
+        except TypeError:
+            # Types orjson doesn't know go through the stdlib encoder
+            return super().dumps(obj, **kwargs)
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
 app = Flask(__name__, static_folder=str(Path(__file__).parent), static_url_path='')
 CORS(app)  # Enable CORS for all routes
+app.json = ORJSONProvider(app)
 
 # Configuration
 # Check if we're running in Docker (executables in /app/) or locally (in build/bin/)
@@ -28,246 +57,432 @@ if Path("/app/server").exists():
 else:
     BUILD_DIR = Path(__file__).parent.parent / "build" / "bin"
 
+SERVER_EXE = BUILD_DIR / ("server.exe" if os.name == 'nt' else "server")
+CLIENT_EXE = BUILD_DIR / ("client.exe" if os.name == 'nt' else "client")
+
 SERVER_DATA_DIR = Path(__file__).parent.parent / "server_data"
 SAMPLE_DATA_DIR = Path(__file__).parent.parent / "sample_data"
 
+# Behind nginx, let the proxy serve downloads from an internal location
+# (e.g. "location /_protected/ { internal; alias /app/server_data/; }")
+USE_X_ACCEL = os.environ.get("USE_X_ACCEL") == "1"
+X_ACCEL_PREFIX = os.environ.get("X_ACCEL_PREFIX", "/_protected/")
+
+def _attachment_params(filename):
+    """Content-Disposition parameters for filename, encoded as send_file does"""
+    try:
+        filename.encode("ascii")
+    except UnicodeEncodeError:
+        # RFC 5987: an ASCII fallback plus the UTF-8 name in filename*
+        simple = unicodedata.normalize("NFKD", filename).encode("ascii", "ignore").decode("ascii")
+        return {"filename": simple, "filename*": f"UTF-8''{quote(filename, safe='!#$&+^`|~')}"}
+    return {"filename": filename}
+
+# Read size for downloads when the WSGI server has no file_wrapper of its
+# own; Werkzeug's default is 8 KiB
+DOWNLOAD_BLOCK_SIZE = 1024 * 1024
+
+def _large_file_wrapper(file, buffer_size=DOWNLOAD_BLOCK_SIZE):
+    """wsgi.file_wrapper that reads at least DOWNLOAD_BLOCK_SIZE at a time"""
+    # Werkzeug's wrap_file always passes its own 8 KiB default, so treat
+    # the requested size as a floor rather than the block size
+    return FileWrapper(file, max(buffer_size, DOWNLOAD_BLOCK_SIZE))
+
+# Uploads up to this size stay in memory; Werkzeug's default spills to
+# disk past 500 KB
+UPLOAD_SPOOL_SIZE = 16 * 1024 * 1024
+
+class SpooledUploadRequest(Request):
+    """Request that buffers file uploads in RAM up to UPLOAD_SPOOL_SIZE"""
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_SIZE, mode="rb+")
+
+app.request_class = SpooledUploadRequest
+
 # Global state
 server_process = None
 server_port = None
 server_output_dir = None
 
 # Health check and monitoring
-app_start_time = datetime.now()
+app_start_time = time.monotonic()
 request_count = 0
 error_count = 0
 
+# CPU usage sampled once a second in the background, so health checks
+# never block in psutil.cpu_percent(interval=1)
+_system_state = {"cpu": 0.0}
+
+def _cpu_sampler():
+    psutil.cpu_percent(None)  # Prime the counters; the first reading is meaningless
+    while True:
+        time.sleep(1)
+        _system_state["cpu"] = psutil.cpu_percent(None)
+
+threading.Thread(target=_cpu_sampler, name="cpu-sampler", daemon=True).start()
+
+# The executables don't move at runtime; re-check them at most every 5 s
+_exe_ok = {"t": 0.0, "server": False, "client": False, "build_dir": False}
+
+def _exes_ok():
+    """Return cached existence flags for the build directory and executables"""
+    now = time.monotonic()
+    if now - _exe_ok["t"] > 5:
+        _exe_ok.update(t=now, server=SERVER_EXE.exists(), client=CLIENT_EXE.exists(),
+                       build_dir=BUILD_DIR.exists())
+    return _exe_ok
+
+def _udp_port_bound(port, timeout=0.05):
+    """Check whether something is bound to a local UDP port"""
+    # An unbound port answers with ICMP port-unreachable, which shows up as
+    # a refused/reset error on recv; silence means the datagram was accepted
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+        s.settimeout(timeout)
+        try:
+            s.connect(("127.0.0.1", port))
+            s.send(b"\x00")
+            s.recv(1)
+        except socket.timeout:
+            return True
+        except OSError:
+            return False
+        return True
+
+def _find_free_udp_port(start_port, attempts):
+    """Return the first port from start_port that a UDP socket can bind, or None"""
+    # No SO_REUSEADDR: on Windows it would let the probe share a port
+    # that is already taken
+    for port in range(start_port, start_port + attempts):
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            try:
+                s.bind(("", port))
+            except OSError:
+                continue
+        return port
+    return None
+
 class ServerManager:
     def __init__(self):
         self.process = None
         self.port = None
         self.output_dir = None
         self.is_running = False
-        self.logs = []
+        self.logs = deque(maxlen=100)
         self.process_id = None  # Track the actual process ID
         self.start_time = None
         self.last_health_check = None
+        self._ps = None  # Cached psutil handle for the running server
+        self._last_poll = 0.0
+        self._start_mono = 0.0
+        # Serialises start/stop against each other; re-entrant so start can stop
+        self._op_lock = threading.RLock()
+        # Guards the fields above. Held only while reading or writing them,
+        # never across a spawn or wait, so status requests don't stall
+        self._lock = threading.Lock()
         
     def start_server(self, port, output_dir):
         """Start the UDP server"""
-        if self.is_running:
-            # Stop existing server first
-            self.stop_server()
-            
-        try:
-            # Ensure output directory exists
-            Path(output_dir).mkdir(parents=True, exist_ok=True)
-            
-            # Build the command
-            server_exe = BUILD_DIR / "server.exe" if os.name == 'nt' else BUILD_DIR / "server"
-            
-            # Check if executable exists
-            if not server_exe.exists():
-                return {"success": False, "error": f"Server executable not found at {server_exe}"}
-            
-            # Try to find an available port starting from the requested port
-            original_port = port
-            max_port_attempts = 10
-            
-            for attempt in range(max_port_attempts):
-                try:
-                    cmd = [str(server_exe), "--port", str(port), "--out", output_dir]
-                    print(f"Attempting to start server on port {port} (attempt {attempt + 1}/{max_port_attempts})")
-                    
-                    # Start the process
-                    self.process = subprocess.Popen(
-                        cmd,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.PIPE,
-                        text=True,
-                        bufsize=1,
-                        universal_newlines=True
-                    )
-                    self.process_id = self.process.pid
-                    
-                    # Wait a moment to see if server starts successfully
-                    time.sleep(3)  # Increased wait time for better stability
-                    
-                    # Check if process is still running
-                    if self.process.poll() is not None:
-                        # Server failed to start, try next port
-                        error_output = self.process.stderr.read() if self.process.stderr else "Unknown error"
-                        print(f"Server failed to start on port {port}: {error_output}")
-                        if "bind failed" in error_output or "10048" in error_output or "address already in use" in error_output.lower():
-                            # Port is in use, try next port
-                            port += 1
-                            continue
-                        else:
-                            # Other error, return it
-                            self.is_running = False
-                            return {"success": False, "error": f"Server failed to start: {error_output}"}
-                    else:
-                        # Server started successfully
-                        self.port = port
-                        self.output_dir = output_dir
-                        self.is_running = True
-                        self.start_time = datetime.now()
-                        
-                        # Start log monitoring thread
-                        threading.Thread(target=self._monitor_logs, daemon=True).start()
-                        
-                        if port != original_port:
-                            return {"success": True, "message": f"Server started on port {port} (original port {original_port} was in use)"}
-                        else:
-                            return {"success": True, "message": f"Server started on port {port}"}
-                            
-                except Exception as e:
-                    if attempt < max_port_attempts - 1:
-                        port += 1
-                        continue
-                    else:
+        with self._op_lock:
+            with self._lock:
+                running = self.is_running
+            if running:
+                # Stop existing server first
+                self.stop_server()
+                
+            try:
+                # Ensure output directory exists
+                Path(output_dir).mkdir(parents=True, exist_ok=True)
+                
+                # Check if executable exists
+                if not _exes_ok()["server"]:
+                    return {"success": False, "error": f"Server executable not found at {SERVER_EXE}"}
+                
+                # Try to find an available port starting from the requested port
+                original_port = port
+                max_port_attempts = 10
+                
+                port = _find_free_udp_port(original_port, max_port_attempts)
+                if port is None:
+                    return {"success": False, "error": f"Could not find available port in range {original_port}-{original_port + max_port_attempts - 1}"}
+                
+                cmd = [str(SERVER_EXE), "--port", str(port), "--out", output_dir]
+                print(f"Starting server on port {port}")
+                
+                # Start the process in its own process group so stop_server can
+                # signal the whole tree at once
+                # Binary pipes: log lines are split and decoded by _monitor_logs
+                process = subprocess.Popen(
+                    cmd,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    close_fds=True,
+                    start_new_session=(os.name != 'nt'),
+                    creationflags=subprocess.CREATE_NEW_PROCESS_GROUP if os.name == 'nt' else 0
+                )
+                # Publish the process right away so a stop can still reach it
+                with self._lock:
+                    self.process = process
+                    self.process_id = process.pid
+                
+                # Wait until the server's socket is bound or the process exits
+                deadline = time.monotonic() + 3.0
+                delay = 0.05
+                while time.monotonic() < deadline:
+                    if process.poll() is not None or _udp_port_bound(port):
+                        break
+                    time.sleep(delay)
+                    delay = min(delay * 2, 0.5)
+                
+                # Check if process is still running
+                if process.poll() is not None:
+                    # communicate() drains and closes both pipes of the dead process
+                    _, stderr_data = process.communicate()
+                    error_output = stderr_data.decode(errors='replace') if stderr_data else "Unknown error"
+                    print(f"Server failed to start on port {port}: {error_output}")
+                    with self._lock:
+                        self.process = None
+                        self.process_id = None
                         self.is_running = False
-                        return {"success": False, "error": str(e)}
-            
-            # If we get here, all ports were tried
-            self.is_running = False
-            return {"success": False, "error": f"Could not find available port in range {original_port}-{original_port + max_port_attempts - 1}"}
-            
-        except Exception as e:
-            self.is_running = False
-            return {"success": False, "error": str(e)}
+                    return {"success": False, "error": f"Server failed to start: {error_output}"}
+                
+                # Server started successfully
+                ps = psutil.Process(process.pid)
+                with self._lock:
+                    self.port = port
+                    self.output_dir = output_dir
+                    self.is_running = True
+                    self.start_time = datetime.now()
+                    self._start_mono = time.monotonic()
+                    self._ps = ps
+                    self._last_poll = time.monotonic()
+                
+                # Start log monitoring thread
+                threading.Thread(target=self._monitor_logs, args=(process,), daemon=True).start()
+                
+                if port != original_port:
+                    return {"success": True, "message": f"Server started on port {port} (original port {original_port} was in use)"}
+                else:
+                    return {"success": True, "message": f"Server started on port {port}"}
+                
+            except Exception as e:
+                with self._lock:
+                    self.is_running = False
+                return {"success": False, "error": str(e)}
     
     def stop_server(self):
         """Stop the UDP server"""
-        if not self.is_running and not self.process:
-            return {"success": True, "message": "Server is not running"}
-            
-        try:
-            if self.process:
-                # Try graceful shutdown first
-                self.process.terminate()
+        with self._op_lock:
+            with self._lock:
+                process = self.process
+                if not self.is_running and not process:
+                    return {"success": True, "message": "Server is not running"}
                 
-                # Wait for graceful shutdown
-                try:
-                    self.process.wait(timeout=10)  # Increased timeout
-                except subprocess.TimeoutExpired:
-                    # Force kill if graceful shutdown fails
-                    print(f"Force killing server process {self.process.pid}")
-                    self.process.kill()
+            try:
+                if process:
+                    # Try graceful shutdown first
+                    self._signal_group(process, force=False)
+                    
+                    # Wait for graceful shutdown
                     try:
-                        self.process.wait(timeout=5)
+                        process.wait(timeout=10)  # Increased timeout
                     except subprocess.TimeoutExpired:
-                        # If still not dead, try to kill the process tree
+                        # Force kill if graceful shutdown fails
+                        print(f"Force killing server process {process.pid}")
+                        self._signal_group(process, force=True)
                         try:
-                            import psutil
-                            parent = psutil.Process(self.process.pid)
-                            for child in parent.children(recursive=True):
-                                child.kill()
-                            parent.kill()
-                        except:
-                            pass
+                            process.wait(timeout=5)
+                        except subprocess.TimeoutExpired:
+                            print(f"Server process {process.pid} did not exit after SIGKILL")
+                    
+                    # stdout is closed by _monitor_logs once it sees EOF
+                    if process.stderr:
+                        process.stderr.close()
                 
-                self.process = None
-                self.process_id = None
-            
-            self.is_running = False
-            self.port = None
-            self.output_dir = None
-            self.start_time = None
-            
-            # Clear logs
-            self.logs = []
-            
-            return {"success": True, "message": "Server stopped successfully"}
-            
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+                with self._lock:
+                    self.process = None
+                    self.process_id = None
+                    self._ps = None
+                    self.is_running = False
+                    self.port = None
+                    self.output_dir = None
+                    self.start_time = None
+                    
+                    # Clear logs
+                    self.logs.clear()
+                
+                return {"success": True, "message": "Server stopped successfully"}
+                
+            except Exception as e:
+                return {"success": False, "error": str(e)}
+    
+    def _signal_group(self, process, force):
+        """Terminate (or kill, if force) the server's process group"""
+        if os.name == 'nt':
+            if force:
+                process.kill()
+            else:
+                process.send_signal(signal.CTRL_BREAK_EVENT)
+            return
+        
+        # Once the server is reaped its pgid can be reused by an unrelated
+        # group, so only signal a child that is still running
+        if process.poll() is not None:
+            return
+        
+        # start_new_session makes the server its own group leader
+        try:
+            os.killpg(process.pid, signal.SIGKILL if force else signal.SIGTERM)
+        except ProcessLookupError:
+            pass  # Already gone
     
-    def _monitor_logs(self):
+    def _monitor_logs(self, process):
         """Monitor server logs in a separate thread"""
-        if not self.process or not self.process.stdout:
+        if not process.stdout:
             return
             
+        stdout = process.stdout
+        pending = b''
+        # strftime once per second rather than once per chunk
+        last_sec = None
+        timestamp = ""
+        
+        def stamp():
+            nonlocal last_sec, timestamp
+            now = int(time.time())
+            if now != last_sec:
+                last_sec = now
+                timestamp = time.strftime("%H:%M:%S", time.localtime(now))
+            return timestamp
+        
         try:
-            for line in iter(self.process.stdout.readline, ''):
-                if line:
-                    timestamp = datetime.now().strftime("%H:%M:%S")
-                    log_entry = f"[{timestamp}] {line.strip()}"
-                    self.logs.append(log_entry)
-                    
-                    # Keep only last 100 log entries
-                    if len(self.logs) > 100:
-                        self.logs = self.logs[-100:]
-        except:
+            # read1 returns whatever is available in one call instead of
+            # looping per line; complete lines are split off locally
+            while True:
+                chunk = stdout.read1(65536)
+                if not chunk:
+                    break
+                *lines, pending = (pending + chunk).split(b'\n')
+                if not lines:
+                    continue
+                
+                timestamp = stamp()
+                for line in lines:
+                    line = line.strip()
+                    if line:
+                        self.logs.append(f"[{timestamp}] {line.decode(errors='replace')}")
+            
+            # Unterminated last line written before the process exited
+            pending = pending.strip()
+            if pending:
+                self.logs.append(f"[{stamp()}] {pending.decode(errors='replace')}")
+        except (OSError, ValueError):
+            # Pipe broke or was closed underneath us
             pass
+        finally:
+            try:
+                stdout.close()
+            except OSError:
+                pass
     
     def get_logs(self):
         """Get server logs"""
-        return self.logs.copy()
+        return list(self.logs)
     
     def get_status(self):
         """Get server status"""
-        status = {
-            "is_running": self.is_running,
-            "port": self.port,
-            "output_dir": self.output_dir,
-            "pid": self.process.pid if self.process else None,
-            "start_time": self.start_time.isoformat() if self.start_time else None,
-            "uptime_seconds": (datetime.now() - self.start_time).total_seconds() if self.start_time else None
-        }
-        
-        # Check if the process is actually still running
-        if status.get('is_running') and status.get('pid'):
-            try:
-                # Check if process is still alive
-                import psutil
-                process = psutil.Process(status['pid'])
-                if not process.is_running():
-                    # Process died, update status
-                    self.is_running = False
-                    self.process = None
-                    self.process_id = None
-                    status = self.get_status()
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                # Process is dead or inaccessible
+        with self._lock:
+            # Check if the process is actually still running
+            if self.is_running and self.process and not self._process_alive():
+                # Process died, update status
                 self.is_running = False
                 self.process = None
                 self.process_id = None
-                status = self.get_status()
+                self._ps = None
+            
+            is_running = self.is_running
+            port = self.port
+            output_dir = self.output_dir
+            pid = self.process.pid if self.process else None
+            start_time = self.start_time
+            start_mono = self._start_mono
         
-        return status
+        return {
+            "is_running": is_running,
+            "port": port,
+            "output_dir": output_dir,
+            "pid": pid,
+            "start_time": start_time.isoformat() if start_time else None,
+            "uptime_seconds": time.monotonic() - start_mono if start_time else None
+        }
+    
+    def _process_alive(self):
+        """Check the server process, touching /proc at most once a second"""
+        # poll() only reaps our own child, so it is the cheap first gate
+        if self.process.poll() is not None:
+            return False
+        
+        now = time.monotonic()
+        if self._ps is None or now - self._last_poll < 1.0:
+            return True
+        self._last_poll = now
+        
+        try:
+            return self._ps.is_running()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            # Process is dead or inaccessible
+            return False
 
 # Global server manager instance
 server_manager = ServerManager()
 
+# Short-lived copy of get_status() for endpoints that only report it
+_status_cache = {"ts": 0.0, "val": None}
+
+def cached_status(ttl=0.25):
+    """Return server_manager.get_status(), recomputed at most every ttl seconds"""
+    now = time.monotonic()
+    if _status_cache["val"] is None or now - _status_cache["ts"] > ttl:
+        _status_cache["val"] = server_manager.get_status()
+        _status_cache["ts"] = now
+    return _status_cache["val"]
+
+def invalidate_status_cache():
+    """Make the next cached_status() call recompute"""
+    _status_cache["val"] = None
+
 # Helper functions for file operations
+# base name -> received paths, rebuilt whenever the directory's mtime moves
+_file_index = {"dir": None, "mtime": None, "map": {}}
+
+def invalidate_file_index():
+    """Force the next base-name lookup to rescan the output directory"""
+    _file_index["mtime"] = None
+
 def find_file_by_base_name(base_filename, output_dir):
     """Find a file that starts with the base filename (handles UDP server naming pattern)"""
     base_filename = base_filename.strip()
     if not base_filename:
         return None
     
-    for file_path in Path(output_dir).iterdir():
-        if file_path.is_file() and file_path.name.startswith(base_filename + '_'):
-            return file_path
-    return None
+    output_dir = str(output_dir)
+    mtime = os.stat(output_dir).st_mtime_ns
+    if _file_index["dir"] != output_dir or _file_index["mtime"] != mtime:
+        index = {}
+        with os.scandir(output_dir) as it:
+            for entry in it:
+                if entry.is_file():
+                    index.setdefault(get_base_filename(entry.name), []).append(Path(entry.path))
+        _file_index.update(dir=output_dir, mtime=mtime, map=index)
+    
+    return _file_index["map"].get(base_filename, [None])[0]
+
+_BASE_RE = re.compile(r'(.*)_\d+_[^_]*', re.DOTALL)
 
 def get_base_filename(full_filename):
     """Extract the base filename from a UDP server filename (removes timestamp and IP suffix)"""
-    if '_' not in full_filename:
-        return full_filename
-    
-    # Find the last underscore followed by numbers (timestamp)
-    parts = full_filename.split('_')
-    if len(parts) >= 3:
-        # Check if the last two parts look like timestamp and IP
-        try:
-            int(parts[-2])  # timestamp should be numeric
-            # If we can parse the timestamp, return everything before it
-            return '_'.join(parts[:-2])
-        except ValueError:
-            pass
-    
-    return full_filename
+    # Everything before "_<numeric timestamp>_<ip:port>"
+    match = _BASE_RE.fullmatch(full_filename)
+    return match.group(1) if match else full_filename
 
 # Request tracking middleware
 @app.before_request
@@ -290,7 +505,7 @@ def health_check():
     
     try:
         # Check if server is responsive
-        uptime = (datetime.now() - app_start_time).total_seconds()
+        uptime = time.monotonic() - app_start_time
         
         health_status = {
             "status": "healthy",
@@ -299,7 +514,7 @@ def health_check():
             "request_count": request_count,
             "error_count": error_count,
             "error_rate": (error_count / request_count * 100) if request_count > 0 else 0,
-            "server_status": server_manager.get_status()
+            "server_status": cached_status()
         }
         
         return jsonify(health_status), 200
@@ -314,10 +529,8 @@ def health_check():
 def detailed_health_check():
     """Detailed health check with system information"""
     try:
-        import psutil
-        
         # System information
-        cpu_percent = psutil.cpu_percent(interval=1)
+        cpu_percent = _system_state["cpu"]
         memory = psutil.virtual_memory()
         
         # Disk usage - handle Windows paths properly
@@ -326,7 +539,7 @@ def detailed_health_check():
                 # On Windows, try C: drive first, then current directory
                 try:
                     disk = psutil.disk_usage('C:\\')
-                except:
+                except OSError:
                     disk = psutil.disk_usage('.')
             else:
                 disk = psutil.disk_usage('/')
@@ -338,15 +551,10 @@ def detailed_health_check():
                     self.free = 1024 * 1024 * 1024  # 1GB
             disk = MockDisk()
         
-        # Network connectivity test
-        network_status = "unknown"
-        try:
-            # Test localhost connectivity
-            socket.create_connection(("127.0.0.1", 5000), timeout=5)
-            network_status = "connected"
-        except:
-            network_status = "disconnected"
+        # Network connectivity: this request reached us, so the listener is up
+        network_status = "connected"
         
+        exes = _exes_ok()
         detailed_status = {
             "status": "healthy",
             "timestamp": datetime.now().isoformat(),
@@ -361,11 +569,11 @@ def detailed_health_check():
                 "status": network_status,
                 "localhost_5000": network_status
             },
-            "server_status": server_manager.get_status(),
+            "server_status": cached_status(),
             "build_artifacts": {
-                "server_exe_exists": (BUILD_DIR / "server.exe").exists() if os.name == 'nt' else (BUILD_DIR / "server").exists(),
-                "client_exe_exists": (BUILD_DIR / "client.exe").exists() if os.name == 'nt' else (BUILD_DIR / "client").exists(),
-                "build_dir_exists": BUILD_DIR.exists()
+                "server_exe_exists": exes["server"],
+                "client_exe_exists": exes["client"],
+                "build_dir_exists": exes["build_dir"]
             }
         }
         
@@ -391,6 +599,7 @@ def start_server():
         output_dir = data.get('output_dir', str(SERVER_DATA_DIR))
         
         result = server_manager.start_server(port, output_dir)
+        invalidate_status_cache()
         return jsonify(result)
     except Exception as e:
         return jsonify({"success": False, "error": f"Failed to start server: {str(e)}"}), 500
@@ -400,6 +609,7 @@ def stop_server():
     """Stop the UDP server"""
     try:
         result = server_manager.stop_server()
+        invalidate_status_cache()
         return jsonify(result)
     except Exception as e:
         return jsonify({"success": False, "error": f"Failed to stop server: {str(e)}"}), 500
@@ -456,122 +666,121 @@ def send_file():
         
         print(f"Processing file: {uploaded_file.filename}")
         
-        # Save uploaded file to temporary location with original filename
-        import tempfile
-        import shutil
+        # Get parameters from form data with better validation
+        host = request.form.get('host', '127.0.0.1')
+        # Use the actual server port that's running
+        port = server_manager.port if server_manager.port else 9000
+        
+        # Validate and convert parameters with error handling
+        try:
+            chunk_size = int(request.form.get('chunk_size', 1024))
+            if chunk_size < 64 or chunk_size > 8192:
+                return jsonify({"success": False, "error": f"Invalid chunk_size: {chunk_size}. Must be between 64 and 8192"}), 400
+        except ValueError:
+            return jsonify({"success": False, "error": "Invalid chunk_size parameter"}), 400
         
-        # Create a temporary directory to preserve the original filename
-        temp_dir = tempfile.mkdtemp()
-        original_filename = uploaded_file.filename
-        temp_file_path = os.path.join(temp_dir, original_filename)
+        try:
+            window_size = int(request.form.get('window_size', 8))
+            if window_size < 1 or window_size > 32:
+                return jsonify({"success": False, "error": f"Invalid window_size: {window_size}. Must be between 1 and 32"}), 400
+        except ValueError:
+            return jsonify({"success": False, "error": "Invalid window_size parameter"}), 400
         
-        # Save the uploaded file with its original name
-        uploaded_file.save(temp_file_path)
-        print(f"File saved to: {temp_file_path}")
+        try:
+            timeout = int(request.form.get('timeout', 300))
+            if timeout < 100 or timeout > 5000:
+                return jsonify({"success": False, "error": f"Invalid timeout: {timeout}. Must be between 100 and 5000"}), 400
+        except ValueError:
+            return jsonify({"success": False, "error": "Invalid timeout parameter"}), 400
         
         try:
-            # Get parameters from form data with better validation
-            host = request.form.get('host', '127.0.0.1')
-            # Use the actual server port that's running
-            port = server_manager.port if server_manager.port else 9000
-            
-            # Validate and convert parameters with error handling
-            try:
-                chunk_size = int(request.form.get('chunk_size', 1024))
-                if chunk_size < 64 or chunk_size > 8192:
-                    return jsonify({"success": False, "error": f"Invalid chunk_size: {chunk_size}. Must be between 64 and 8192"}), 400
-            except ValueError:
-                return jsonify({"success": False, "error": "Invalid chunk_size parameter"}), 400
-            
-            try:
-                window_size = int(request.form.get('window_size', 8))
-                if window_size < 1 or window_size > 32:
-                    return jsonify({"success": False, "error": f"Invalid window_size: {window_size}. Must be between 1 and 32"}), 400
-            except ValueError:
-                return jsonify({"success": False, "error": "Invalid window_size parameter"}), 400
-            
-            try:
-                timeout = int(request.form.get('timeout', 300))
-                if timeout < 100 or timeout > 5000:
-                    return jsonify({"success": False, "error": f"Invalid timeout: {timeout}. Must be between 100 and 5000"}), 400
-            except ValueError:
-                return jsonify({"success": False, "error": "Invalid timeout parameter"}), 400
-            
-            try:
-                max_retries = int(request.form.get('max_retries', 3))
-                if max_retries < 1 or max_retries > 10:
-                    return jsonify({"success": False, "error": f"Invalid max_retries: {max_retries}. Must be between 1 and 10"}), 400
-            except ValueError:
-                return jsonify({"success": False, "error": "Invalid max_retries parameter"}), 400
-            
-            print(f"Transfer parameters: host={host}, port={port}, chunk_size={chunk_size}, window_size={window_size}, timeout={timeout}, max_retries={max_retries}")
-            
-            # Build the command
-            client_exe = BUILD_DIR / "client.exe" if os.name == 'nt' else BUILD_DIR / "client"
-            
-            if not client_exe.exists():
-                return jsonify({"success": False, "error": f"Client executable not found at {client_exe}"}), 500
-            
-            cmd = [
-                str(client_exe),
-                "--host", host,
-                "--port", str(port),
-                "--file", temp_file_path,
-                "--chunk", str(chunk_size),
-                "--window", str(window_size),
-                "--timeout", str(timeout),
-                "--max-retries", str(max_retries)
-            ]
-            
-            # Run the client with longer timeout for large files
-            start_time = time.time()
-            print(f"Running command: {' '.join(cmd)}")
-            
-            # Calculate timeout based on file size: 1 minute per MB + 2 minutes base
-            file_size_mb = os.path.getsize(temp_file_path) / (1024 * 1024)
-            calculated_timeout = max(300, int(file_size_mb * 60 + 120))  # At least 5 minutes, more for larger files
-            print(f"Using timeout: {calculated_timeout} seconds for {file_size_mb:.2f} MB file")
-            
-            # Final check if server is still running before starting transfer
-            if not server_manager.is_running:
-                return jsonify({"success": False, "error": "Server stopped running before transfer could begin"}), 400
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=calculated_timeout)
-            end_time = time.time()
+            max_retries = int(request.form.get('max_retries', 3))
+            if max_retries < 1 or max_retries > 10:
+                return jsonify({"success": False, "error": f"Invalid max_retries: {max_retries}. Must be between 1 and 10"}), 400
+        except ValueError:
+            return jsonify({"success": False, "error": "Invalid max_retries parameter"}), 400
+        
+        print(f"Transfer parameters: host={host}, port={port}, chunk_size={chunk_size}, window_size={window_size}, timeout={timeout}, max_retries={max_retries}")
+        
+        # Build the command
+        if not _exes_ok()["client"]:
+            return jsonify({"success": False, "error": f"Client executable not found at {CLIENT_EXE}"}), 500
+        
+        # The upload is piped straight into the client's stdin ("--file -"),
+        # so it never makes a round trip through a temporary file
+        cmd = [
+            str(CLIENT_EXE),
+            "--host", host,
+            "--port", str(port),
+            "--file", "-",
+            "--name", uploaded_file.filename,
+            "--chunk", str(chunk_size),
+            "--window", str(window_size),
+            "--timeout", str(timeout),
+            "--max-retries", str(max_retries)
+        ]
+        
+        # Measure the upload; fall back to the request size if the stream can't seek
+        upload_stream = uploaded_file.stream
+        try:
+            upload_stream.seek(0, os.SEEK_END)
+            file_size = upload_stream.tell()
+            upload_stream.seek(0)
+        except (AttributeError, OSError):
+            file_size = request.content_length or 0
+        
+        # Run the client with longer timeout for large files
+        t0 = time.monotonic()
+        print(f"Running command: {' '.join(cmd)}")
+        
+        # Calculate timeout based on file size: 1 minute per MB + 2 minutes base
+        file_size_mb = file_size / (1024 * 1024)
+        calculated_timeout = max(300, int(file_size_mb * 60 + 120))  # At least 5 minutes, more for larger files
+        print(f"Using timeout: {calculated_timeout} seconds for {file_size_mb:.2f} MB file")
+        
+        # Final check if server is still running before starting transfer
+        if not server_manager.is_running:
+            return jsonify({"success": False, "error": "Server stopped running before transfer could begin"}), 400
+        
+        process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        try:
+            shutil.copyfileobj(upload_stream, process.stdin, 1024 * 1024)
+        except BrokenPipeError:
+            # Client exited early; its stderr explains why
+            pass
+        try:
+            stdout, stderr = process.communicate(timeout=calculated_timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            raise
+        duration = time.monotonic() - t0
+        stdout = stdout.decode(errors='replace')
+        stderr = stderr.decode(errors='replace')
+        
+        print(f"Client return code: {process.returncode}")
+        print(f"Client stdout: {stdout}")
+        print(f"Client stderr: {stderr}")
+        
+        if process.returncode == 0:
+            speed = file_size / duration / 1024  # KB/s
             
-            print(f"Client return code: {result.returncode}")
-            print(f"Client stdout: {result.stdout}")
-            print(f"Client stderr: {result.stderr}")
+            # No settle delay needed: the server closes the output file
+            # before it acknowledges FIN, so exit code 0 means it is on disk
             
-            if result.returncode == 0:
-                duration = end_time - start_time
-                file_size = os.path.getsize(temp_file_path)
-                speed = file_size / duration / 1024  # KB/s
-                
-                # Wait a moment for file to be written
-                time.sleep(2)  # Increased wait time for debugging
-                
-                return jsonify({
-                    "success": True,
-                    "message": "File transferred successfully",
-                    "duration": duration,
-                    "speed": speed,
-                    "file_size": file_size
-                })
-            else:
-                error_msg = result.stderr if result.stderr else "Unknown transfer error"
-                return jsonify({
-                    "success": False,
-                    "error": f"Transfer failed: {error_msg}"
-                }), 500
-                
-        finally:
-            # Clean up temporary directory and file
-            try:
-                shutil.rmtree(temp_dir)
-                print(f"Cleaned up temporary directory: {temp_dir}")
-            except Exception as cleanup_error:
-                print(f"Warning: Failed to clean up temporary directory {temp_dir}: {cleanup_error}")
+            return jsonify({
+                "success": True,
+                "message": "File transferred successfully",
+                "duration": duration,
+                "speed": speed,
+                "file_size": file_size
+            })
+        else:
+            error_msg = stderr if stderr else "Unknown transfer error"
+            return jsonify({
+                "success": False,
+                "error": f"Transfer failed: {error_msg}"
+            }), 500
                 
     except subprocess.TimeoutExpired:
         return jsonify({"success": False, "error": "Transfer timed out - the file may be too large or the server may be busy"}), 408
@@ -593,24 +802,27 @@ def list_files():
             print(f"Output directory does not exist: {output_dir}")
             return jsonify({"files": [], "message": "Output directory does not exist"})
         
-        for file_path in Path(output_dir).iterdir():
-            if file_path.is_file():
+        # scandir entries carry the file type from the directory listing,
+        # so only the stat below costs a syscall per file
+        with os.scandir(output_dir) as it:
+            for entry in it:
                 try:
-                    stat = file_path.stat()
+                    if not entry.is_file(follow_symlinks=False):
+                        continue
+                    stat = entry.stat(follow_symlinks=False)
                     # Include empty files for debugging (temporarily)
                     if stat.st_size == 0:
-                        print(f"Found empty file: {file_path.name} (including for debugging)")
+                        print(f"Found empty file: {entry.name} (including for debugging)")
                         # Don't skip empty files for now to debug the issue
-                    base_name = get_base_filename(file_path.name)
                     files.append({
-                        "name": file_path.name,
-                        "base_name": base_name,
+                        "name": entry.name,
+                        "base_name": get_base_filename(entry.name),
                         "size": stat.st_size,
                         "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                        "path": str(file_path)
+                        "path": entry.path
                     })
-                except Exception as file_error:
-                    print(f"Error reading file {file_path}: {file_error}")
+                except OSError as file_error:
+                    print(f"Error reading file {entry.path}: {file_error}")
                     continue
         
         # Sort files by modification time (most recent first)
@@ -655,39 +867,27 @@ def download_file(filename):
             return jsonify({"success": False, "error": f"'{filename}' is not a file"}), 400
         
         print(f"Sending file: {file_path}")
-        # Try different approaches for Flask compatibility
-        try:
-            # First try with download_name (newer Flask versions)
-            return send_file(
-                file_path, 
-                as_attachment=True, 
-                download_name=filename,
-                mimetype='application/octet-stream'
-            )
-        except TypeError:
-            try:
-                # Fallback to attachment_filename (older Flask versions)
-                return send_file(
-                    file_path, 
-                    as_attachment=True, 
-                    attachment_filename=filename,
-                    mimetype='application/octet-stream'
-                )
-            except TypeError:
-                try:
-                    # Another fallback without filename
-                    return send_file(
-                        file_path, 
-                        as_attachment=True,
-                        mimetype='application/octet-stream'
-                    )
-                except Exception as e:
-                    # Last resort: return file content directly
-                    with open(file_path, 'rb') as f:
-                        content = f.read()
-                    response = app.response_class(content, mimetype='application/octet-stream')
-                    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
-                    return response
+        if USE_X_ACCEL:
+            # nginx streams the file itself with sendfile(2)
+            response = Response(mimetype='application/octet-stream')
+            response.headers['X-Accel-Redirect'] = X_ACCEL_PREFIX + quote(file_path.name)
+            response.headers.set('Content-Disposition', 'attachment', **_attachment_params(filename))
+            return response
+        
+        # Servers with a native file_wrapper (sendfile) keep it; the
+        # fallback path streams in 1 MiB reads instead of 8 KiB
+        request.environ.setdefault('wsgi.file_wrapper', _large_file_wrapper)
+        
+        # conditional=True answers If-None-Match and Range requests, so
+        # interrupted downloads can resume
+        return flask_send_file(
+            file_path,
+            as_attachment=True,
+            download_name=filename,
+            mimetype='application/octet-stream',
+            conditional=True,
+            etag=True
+        )
         
     except Exception as e:
         print(f"Download error: {str(e)}")
@@ -717,6 +917,7 @@ def delete_file(filename):
                 print(f"Found file by base name: {file_path}")
         
         file_path.unlink()
+        invalidate_file_index()
         print(f"Successfully deleted: {file_path}")
         return jsonify({"success": True, "message": "File deleted successfully"})
         
@@ -724,6 +925,27 @@ def delete_file(filename):
         print(f"Error deleting file {filename}: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
 
+# stat/unlink release the GIL, so a few threads overlap the metadata I/O
+_cleanup_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="cleanup")
+CLEANUP_BATCH_SIZE = 512
+
+# fstatat/unlinkat against an open directory skip the path walk per file
+_CLEANUP_DIR_FD = (hasattr(os, 'O_DIRECTORY')
+                   and {os.stat, os.unlink} <= os.supports_dir_fd)
+
+def _remove_empty_files(names, output_dir, dir_fd=None):
+    """Unlink the zero-size files among names, returning the removed names"""
+    removed = []
+    for name in names:
+        target = name if dir_fd is not None else os.path.join(output_dir, name)
+        try:
+            if os.stat(target, dir_fd=dir_fd, follow_symlinks=False).st_size == 0:
+                os.unlink(target, dir_fd=dir_fd)
+                removed.append(name)
+        except OSError as file_error:
+            print(f"Error processing file {os.path.join(output_dir, name)}: {file_error}")
+    return removed
+
 @app.route('/api/files/cleanup', methods=['POST'])
 def cleanup_empty_files():
     """Clean up empty files from the server output directory"""
@@ -732,17 +954,40 @@ def cleanup_empty_files():
         cleaned_count = 0
         
         if os.path.exists(output_dir):
-            for file_path in Path(output_dir).iterdir():
-                if file_path.is_file():
+            # Finish the directory scan before unlinking so readdir never
+            # races our own deletions; the file type comes with the entry
+            candidates = []
+            with os.scandir(output_dir) as it:
+                for entry in it:
                     try:
-                        stat = file_path.stat()
-                        if stat.st_size == 0:
-                            file_path.unlink()
-                            cleaned_count += 1
-                            print(f"Cleaned up empty file: {file_path.name}")
-                    except Exception as file_error:
-                        print(f"Error processing file {file_path}: {file_error}")
+                        if entry.is_file(follow_symlinks=False):
+                            candidates.append(entry.name)
+                    except OSError as file_error:
+                        print(f"Error processing file {entry.path}: {file_error}")
                         continue
+            
+            # Size check and unlink run per batch on the cleanup pool
+            batches = [candidates[i:i + CLEANUP_BATCH_SIZE]
+                       for i in range(0, len(candidates), CLEANUP_BATCH_SIZE)]
+            removed = []
+            dir_fd = os.open(output_dir, os.O_RDONLY | os.O_DIRECTORY) if _CLEANUP_DIR_FD else None
+            try:
+                if len(batches) > 1:
+                    futures = [_cleanup_pool.submit(_remove_empty_files, batch, str(output_dir), dir_fd)
+                               for batch in batches]
+                    for future in as_completed(futures):
+                        removed.extend(future.result())
+                elif batches:
+                    removed = _remove_empty_files(batches[0], str(output_dir), dir_fd)
+            finally:
+                if dir_fd is not None:
+                    os.close(dir_fd)
+            cleaned_count = len(removed)
+            
+            # One write for the whole run instead of a print per file
+            if removed:
+                sys.stdout.write("Cleaned up empty files:\n" + "\n".join(removed) + "\n")
+                sys.stdout.flush()
         
         return jsonify({
             "success": True, 
@@ -753,17 +998,34 @@ def cleanup_empty_files():
         print(f"Error during cleanup: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
 
+class _DiscardFile(io.BytesIO):
+    """File sink that accepts upload bytes and keeps none of them"""
+    def write(self, data):
+        return len(data)
+
+def _discard_stream_factory(total_content_length, content_type, filename, content_length=None):
+    return _DiscardFile()
+
 @app.route('/api/debug/upload-test', methods=['POST'])
 def debug_upload_test():
     """Debug endpoint to test file upload without actual transfer"""
     try:
-        print(f"Debug upload test - Request files: {list(request.files.keys())}")
-        print(f"Debug upload test - Request form: {dict(request.form)}")
+        # Only the part headers matter here, so parse the multipart body
+        # ourselves and drop file contents as they stream past instead of
+        # letting request.files buffer them. The request's own parser keeps
+        # its content-length, part-count and form-memory limits
+        parser = request.make_form_data_parser()
+        parser.stream_factory = _discard_stream_factory
+        _, form, files = parser.parse(request.stream, request.mimetype,
+                                      request.content_length, request.mimetype_params)
         
-        if 'file' not in request.files:
+        print(f"Debug upload test - Request files: {list(files.keys())}")
+        print(f"Debug upload test - Request form: {dict(form)}")
+        
+        if 'file' not in files:
             return jsonify({"success": False, "error": "No file in request"}), 400
         
-        uploaded_file = request.files['file']
+        uploaded_file = files['file']
         if uploaded_file.filename == '':
             return jsonify({"success": False, "error": "Empty filename"}), 400
         
@@ -774,34 +1036,80 @@ def debug_upload_test():
             "filename": uploaded_file.filename,
             "content_type": uploaded_file.content_type,
             "server_running": server_manager.is_running,
-            "server_status": server_manager.get_status()
+            "server_status": cached_status()
         })
+    except RequestEntityTooLarge as e:
+        return jsonify({"success": False, "error": e.description}), 413
     except Exception as e:
         return jsonify({"success": False, "error": f"Debug test failed: {str(e)}"}), 500
 
 # Error handlers
+# Static error bodies are serialized once; each request still gets its own
+# Response because after_request hooks (CORS) mutate the headers
+_NOT_FOUND_BODY = b'{"error":"Endpoint not found"}'
+_INTERNAL_ERROR_BODY = b'{"error":"Internal server error"}'
+
 @app.errorhandler(404)
 def not_found(error):
-    return jsonify({"error": "Endpoint not found"}), 404
+    return Response(_NOT_FOUND_BODY, status=404, mimetype='application/json')
 
 @app.errorhandler(500)
 def internal_error(error):
-    return jsonify({"error": "Internal server error"}), 500
+    return Response(_INTERNAL_ERROR_BODY, status=500, mimetype='application/json')
 
 @app.errorhandler(Exception)
 def handle_exception(e):
     return jsonify({"error": f"Unhandled exception: {str(e)}"}), 500
 
+def reuse_addr_socket(host, port, backlog=128):
+    """Bind a listening socket that a restarted backend can take over at once"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    # SO_REUSEADDR only rebinds past TIME_WAIT; a second live backend still
+    # fails to bind. Only on POSIX: on Windows it lets another process steal
+    # a port that is in use
+    if os.name != 'nt':
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    return sock
+
+def _exit_on_signal(signum, frame):
+    """Exit on a signal so the atexit hook stops the UDP server"""
+    # stop_server takes locks the interrupted thread may hold, so it must
+    # not run inside the handler itself
+    sys.exit(128 + signum)
+
 if __name__ == '__main__':
     # Configure Flask for better performance and reliability
     app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
     app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 0  # Disable caching for development
     
-    # Run with improved settings
-    app.run(
-        host='0.0.0.0',  # Allow external connections for testing
-        port=5000,
-        debug=False,  # Disable debug mode for production-like testing
-        threaded=True,  # Enable threading for better concurrency
-        use_reloader=False  # Disable reloader to avoid duplicate processes
-    )
+    # The UDP server runs in its own process group, so a terminal Ctrl+C or
+    # a SIGTERM aimed at the backend no longer reaches it; stop it ourselves
+    atexit.register(server_manager.stop_server)
+    for signame in ('SIGINT', 'SIGTERM', 'SIGBREAK'):
+        if hasattr(signal, signame):
+            signal.signal(getattr(signal, signame), _exit_on_signal)
+    
+    # Serve through waitress: a fixed worker pool instead of Werkzeug's
+    # thread-per-request dev server. start_ui.py and the Docker image both
+    # launch the UI this way (python server.py)
+    try:
+        from waitress import serve
+    except ImportError:
+        print("waitress not installed, falling back to the Flask development server")
+        app.run(
+            host='0.0.0.0',  # Allow external connections for testing
+            port=5000,
+            debug=False,  # Disable debug mode for production-like testing
+            threaded=True,  # Enable threading for better concurrency
+            use_reloader=False  # Disable reloader to avoid duplicate processes
+        )
+    else:
+        serve(
+            app,
+            sockets=[reuse_addr_socket('0.0.0.0', 5000)],  # Allow external connections for testing
+            threads=8,
+            connection_limit=200,
+            channel_timeout=120
+        )
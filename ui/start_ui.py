@@ -6,11 +6,20 @@ Handles setup, dependency installation, and launching the UI
 
 import os
 import sys
+import hashlib
+import importlib.util
+import select
+import socket
 import subprocess
 import webbrowser
 import time
 from pathlib import Path
 
+_UI_DIR = Path(__file__).resolve().parent
+_ROOT_DIR = _UI_DIR.parent
+_BUILD_DIR = _ROOT_DIR / "build"
+_SERVER_DATA_DIR = _ROOT_DIR / "server_data"
+
 def check_python_version():
     """Check if Python version is compatible"""
     if sys.version_info < (3, 7):
@@ -21,41 +30,63 @@ def check_python_version():
 
 def install_dependencies():
     """Install required Python dependencies"""
-    requirements_file = Path(__file__).parent / "requirements.txt"
+    requirements_file = _UI_DIR / "requirements.txt"
     
     if not requirements_file.exists():
         print("Error: requirements.txt not found")
         sys.exit(1)
     
+    # Skip pip entirely when this interpreter already installed this exact
+    # requirements.txt
+    digest = hashlib.sha256(requirements_file.read_bytes() + sys.executable.encode()).hexdigest()
+    cache_file = _UI_DIR / ".ui_deps_cache"
+    try:
+        cached = cache_file.read_text().strip()
+    except OSError:
+        cached = None
+    if cached == digest and importlib.util.find_spec("flask") is not None:
+        print("✓ Dependencies cached")
+        return
+    
     print("Installing Python dependencies...")
     try:
+        # Stop pip from checking PyPI for its own new version and prompting
         subprocess.run([
-            sys.executable, "-m", "pip", "install", "-r", str(requirements_file)
-        ], check=True)
+            sys.executable, "-m", "pip", "install",
+            "--disable-pip-version-check", "--no-input", "-q",
+            "-r", str(requirements_file)
+        ], check=True, env={"PIP_NO_PYTHON_VERSION_WARNING": "1", **os.environ})
         print("✓ Dependencies installed successfully")
+        try:
+            cache_file.write_text(digest)
+        except OSError:
+            pass
     except subprocess.CalledProcessError as e:
         print(f"Error installing dependencies: {e}")
         sys.exit(1)
 
 def check_build():
     """Check if the project is built"""
-    build_dir = Path(__file__).parent.parent / "build"
-    server_exe = build_dir / "bin" / ("server.exe" if os.name == 'nt' else "server")
-    client_exe = build_dir / "bin" / ("client.exe" if os.name == 'nt' else "client")
+    server_exe = _BUILD_DIR / "bin" / ("server.exe" if os.name == 'nt' else "server")
+    client_exe = _BUILD_DIR / "bin" / ("client.exe" if os.name == 'nt' else "client")
     
-    if not build_dir.exists():
+    # One directory read instead of a stat per artifact
+    try:
+        with os.scandir(_BUILD_DIR / "bin") as it:
+            names = {entry.name for entry in it}
+    except FileNotFoundError:
         print("Error: Build directory not found")
         print("Please build the project first:")
         print("  cmake -B build -S .")
         print("  cmake --build build")
         sys.exit(1)
     
-    if not server_exe.exists():
+    if server_exe.name not in names:
         print(f"Error: Server executable not found at {server_exe}")
         print("Please build the project first")
         sys.exit(1)
     
-    if not client_exe.exists():
+    if client_exe.name not in names:
         print(f"Error: Client executable not found at {client_exe}")
         print("Please build the project first")
         sys.exit(1)
@@ -64,39 +95,100 @@ def check_build():
 
 def create_directories():
     """Create necessary directories"""
-    server_data_dir = Path(__file__).parent.parent / "server_data"
-    server_data_dir.mkdir(exist_ok=True)
-    print(f"✓ Server data directory: {server_data_dir}")
+    _SERVER_DATA_DIR.mkdir(exist_ok=True)
+    print(f"✓ Server data directory: {_SERVER_DATA_DIR}")
+
+def _read_log_tail(log_path, max_bytes=4096):
+    """Return the last max_bytes of the backend log as text"""
+    try:
+        with open(log_path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - max_bytes))
+            return f.read().decode(errors="replace")
+    except OSError as e:
+        return f"(could not read {log_path}: {e})"
+
+def _backend_port_open():
+    """Check whether anything accepts connections on the backend port"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        return sock.connect_ex(('127.0.0.1', 5000)) == 0
 
 def start_backend():
     """Start the Flask backend server"""
-    server_script = Path(__file__).parent / "server.py"
+    server_script = _UI_DIR / "server.py"
+    log_path = _UI_DIR / "backend.log"
     
     print("Starting backend server...")
+    # Another listener on 5000 would answer the readiness probe below while
+    # the new backend dies with "Address already in use"
+    if _backend_port_open():
+        print("Error starting backend server: port 5000 is already in use")
+        print("Stop the other backend (or whatever holds the port) and try again")
+        sys.exit(1)
+    
     try:
-        # Start the server in a subprocess
-        process = subprocess.Popen([
-            sys.executable, str(server_script)
-        ], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        # Start the server in a subprocess. close_fds=False lets CPython
+        # launch it with os.posix_spawn instead of fork+exec; descriptors
+        # Python opens are non-inheritable anyway (PEP 446)
+        # Output goes straight to backend.log: an undrained pipe would
+        # stall the backend once its 64 KB buffer filled up
+        with open(log_path, "ab") as log_file:
+            process = subprocess.Popen([
+                sys.executable, str(server_script)
+            ], stdout=log_file, stderr=subprocess.STDOUT, close_fds=False)
         
-        # Wait a moment for server to start
-        time.sleep(2)
+        # Wait until the backend accepts connections (or exits), up to 5 s
+        deadline = time.monotonic() + 5.0
+        while time.monotonic() < deadline and process.poll() is None:
+            if _backend_port_open():
+                break
+            time.sleep(0.025)
+        
+        # Keep watching briefly so a backend that dies right after the port
+        # opens is still reported as a failure
+        settle = time.monotonic() + 0.5
+        while time.monotonic() < settle and process.poll() is None:
+            time.sleep(0.05)
         
         # Check if server started successfully
         if process.poll() is None:
             print("✓ Backend server started successfully")
+            print(f"  Backend log: {log_path}")
             return process
         else:
-            stdout, stderr = process.communicate()
             print(f"Error starting backend server:")
-            print(f"STDOUT: {stdout}")
-            print(f"STDERR: {stderr}")
+            print(_read_log_tail(log_path))
             sys.exit(1)
             
     except Exception as e:
         print(f"Error starting backend server: {e}")
         sys.exit(1)
 
+def wait_for_exit(process, timeout):
+    """Wait up to timeout seconds for process to exit; True if it did"""
+    # On Linux 5.3+ a pidfd turns readable when the process exits, so one
+    # select() replaces subprocess's sleep-and-poll loop
+    if hasattr(os, "pidfd_open"):
+        try:
+            pidfd = os.pidfd_open(process.pid)
+        except OSError:
+            pidfd = None  # Old kernel, or the process is already reaped
+        if pidfd is not None:
+            try:
+                ready, _, _ = select.select([pidfd], [], [], timeout)
+            finally:
+                os.close(pidfd)
+            if not ready:
+                return False
+            process.wait()  # Exited already; this just reaps it
+            return True
+    
+    try:
+        process.wait(timeout=timeout)
+        return True
+    except subprocess.TimeoutExpired:
+        return False
+
 def open_browser():
     """Open the UI in the default browser"""
     url = "http://localhost:5000"
@@ -114,14 +206,18 @@ def main():
     print("UDP Transfer UI Startup")
     print("=" * 40)
     
-    # Check Python version
-    check_python_version()
-    
-    # Install dependencies
-    install_dependencies()
-    
-    # Check build
-    check_build()
+    # Warm restarts can set UDP_UI_SKIP_CHECKS=1 when nothing has changed
+    if os.environ.get("UDP_UI_SKIP_CHECKS") == "1":
+        print("✓ Skipping environment checks (UDP_UI_SKIP_CHECKS=1)")
+    else:
+        # Check Python version
+        check_python_version()
+        
+        # Install dependencies
+        install_dependencies()
+        
+        # Check build
+        check_build()
     
     # Create directories
     create_directories()
@@ -146,27 +242,12 @@ def main():
         backend_process.terminate()
         
         # Wait for graceful shutdown
-        try:
-            backend_process.wait(timeout=10)
+        if wait_for_exit(backend_process, 10):
             print("✓ Server stopped gracefully")
-        except subprocess.TimeoutExpired:
+        else:
             print("Force killing server...")
             backend_process.kill()
-            try:
-                backend_process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                pass
-        
-        # Force close port 5000 if still in use
-        import socket
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            sock.bind(('localhost', 5000))
-            sock.close()
-            print("✓ Port 5000 released")
-        except:
-            pass
+            wait_for_exit(backend_process, 5)
         
         print("Goodbye!")
 